@@ -1,9 +1,17 @@
 import pygame
 from heapq import heappush, heappop
-from collections import deque
+from collections import deque, OrderedDict
+from functools import lru_cache
+from array import array
 import sys
 import os
 
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # Numba is optional; the pure-Python searches below are used without it
+    njit = None
+
 # ---------- CONFIG ----------
 WIDTH, HEIGHT = 600, 600     # window size
 ROWS, COLS = 30, 30          # grid size
@@ -12,6 +20,7 @@ CELL_SIZE = WIDTH // COLS
 # Movement intervals (ms)
 PAC_MOVE_INTERVAL = 120      # smaller = faster Pac-Man
 GHOST_MOVE_INTERVAL = 260    # bigger = slower ghost
+PAC_ANIM_INTERVAL = 250      # Pac-Man mouth open/close period
 
 # Cell types
 EMPTY = 0
@@ -23,6 +32,9 @@ CLOSED = 5
 PATH = 6      # not used visually now, but kept for compatibility
 REWARD = 7
 
+# 4-neighbour moves (down, up, right, left)
+DIRS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
 # Neon / glowy colors
 COLORS = {
     EMPTY:  (15, 15, 35),         # dark background
@@ -41,6 +53,22 @@ pygame.display.set_caption("A* Pac-Man Maze (Neon, Corner Ghosts, Timer, Levels)
 FONT_SMALL = pygame.font.SysFont("consolas", 20)
 FONT_BIG = pygame.font.SysFont("consolas", 36)
 
+# Static maze (walls, cells, grid lines) is rendered here and only rebuilt when the grid changes
+bg_surface = pygame.Surface((WIDTH, HEIGHT)).convert()
+# HUD areas, repainted only when their contents change: score/timer while playing,
+# widened to the whole top strip for the game-over messages
+HUD_STATS_RECT = pygame.Rect(0, 10, WIDTH // 3, 25 + FONT_SMALL.get_height())
+HUD_RECT = pygame.Rect(0, 0, WIDTH, 10 + 90 + FONT_BIG.get_height())
+
+# Static controls hint; baked into the background so it is never re-blended over itself
+HINT_SURF = FONT_SMALL.render(
+    "L: load level   C: clear   SPACE: start   R: reset   Click: S/G/Walls   Shift+Click: diamond   G+Click: ghost",
+    True, (160, 160, 255),
+).convert_alpha()
+
+HUD_CACHE_SIZE = 64
+_hud_cache = OrderedDict()
+
 
 # ---------- UTILS ----------
 
@@ -57,7 +85,8 @@ def corner_positions():
 # ---------- GRID & DRAWING ----------
 
 def make_grid():
-    return [[EMPTY for _ in range(COLS)] for _ in range(ROWS)]
+    """Flat row-major grid: cell (r, c) lives at grid[r * COLS + c]."""
+    return bytearray(ROWS * COLS)  # all EMPTY
 
 
 def draw_grid_lines(surface):
@@ -68,11 +97,21 @@ def draw_grid_lines(surface):
         pygame.draw.line(surface, (60, 60, 120), (c * CELL_SIZE, 0), (c * CELL_SIZE, HEIGHT), 1)
 
 
+def create_grid_lines_surface():
+    surf = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+    draw_grid_lines(surf)
+    return surf.convert_alpha()
+
+
+# All grid lines pre-rendered once; background rebuilds blit this instead of drawing each line
+GRID_LINES_SURF = create_grid_lines_surface()
+
+
 def draw_grid(surface, grid):
     surface.fill((5, 5, 20))  # deep dark blue background
     for r in range(ROWS):
         for c in range(COLS):
-            cell_type = grid[r][c]
+            cell_type = grid[r * COLS + c]
             color = COLORS.get(cell_type, (0, 0, 0))
             rect = pygame.Rect(c * CELL_SIZE, r * CELL_SIZE, CELL_SIZE, CELL_SIZE)
 
@@ -84,11 +123,16 @@ def draw_grid(surface, grid):
             else:
                 pygame.draw.rect(surface, color, rect, border_radius=4)
 
-    draw_grid_lines(surface)
+    surface.blit(GRID_LINES_SURF, (0, 0))
+
+
+def rebuild_bg(grid):
+    """Re-render the cached maze background after the grid has been edited."""
+    draw_grid(bg_surface, grid)
+    bg_surface.blit(HINT_SURF, (10, HEIGHT - 25))
 
 
-def draw_hud(surface, score, start_time, end_time, game_over, final_score, reason):
-    # Timer
+def hud_time_str(start_time, end_time, game_over):
     if start_time is not None:
         if game_over and end_time is not None:
             elapsed_ms = end_time - start_time
@@ -97,13 +141,14 @@ def draw_hud(surface, score, start_time, end_time, game_over, final_score, reaso
         elapsed_sec = elapsed_ms // 1000
         mins = elapsed_sec // 60
         secs = elapsed_sec % 60
-        time_str = f"{mins:02d}:{secs:02d}"
-    else:
-        time_str = "00:00"
+        return f"{mins:02d}:{secs:02d}"
+    return "00:00"
+
 
+def draw_hud(surface, score, time_str, game_over, final_score, reason):
     # Neon HUD
-    score_text = FONT_SMALL.render(f"♦ {score}", True, (255, 215, 0))
-    time_text = FONT_SMALL.render(f"⏱ {time_str}", True, (0, 255, 200))
+    score_text = cached_render(FONT_SMALL, f"♦ {score}", (255, 215, 0))
+    time_text = cached_render(FONT_SMALL, f"⏱ {time_str}", (0, 255, 200))
     surface.blit(score_text, (10, 10))
     surface.blit(time_text, (10, 35))
 
@@ -117,14 +162,28 @@ def draw_hud(surface, score, start_time, end_time, game_over, final_score, reaso
         else:
             msg = "GAME OVER"
 
-        msg_surf = FONT_BIG.render(msg, True, (255, 80, 160))
+        msg_surf = cached_render(FONT_BIG, msg, (255, 80, 160))
         surface.blit(msg_surf, (WIDTH // 2 - msg_surf.get_width() // 2, 10 + 50))
 
         if final_score is not None:
-            fs_surf = FONT_BIG.render(f"Final Score: {final_score}", True, (255, 255, 255))
+            fs_surf = cached_render(FONT_BIG, f"Final Score: {final_score}", (255, 255, 255))
             surface.blit(fs_surf, (WIDTH // 2 - fs_surf.get_width() // 2, 10 + 90))
 
 
+def cached_render(font, text, color):
+    """font.render() with a small LRU cache, so unchanged HUD text is not re-rendered every frame."""
+    key = (id(font), text, color)
+    surf = _hud_cache.get(key)
+    if surf is None:
+        surf = font.render(text, True, color).convert_alpha()
+        _hud_cache[key] = surf
+        if len(_hud_cache) > HUD_CACHE_SIZE:
+            _hud_cache.popitem(last=False)
+    else:
+        _hud_cache.move_to_end(key)
+    return surf
+
+
 def get_cell_from_mouse(pos):
     x, y = pos
     c = x // CELL_SIZE
@@ -134,114 +193,299 @@ def get_cell_from_mouse(pos):
     return None
 
 
+def cell_rect(cell):
+    r, c = cell
+    return pygame.Rect(c * CELL_SIZE, r * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+
+
 # ---------- A* SEARCH (Pac-Man) ----------
 
-def heuristic(a, b):
-    (r1, c1) = a
-    (r2, c2) = b
-    return abs(r1 - r2) + abs(c1 - c2)
+# Scratch buffers reused by every search call: reset in place (a C-level copy) instead of reallocated
+N_CELLS = ROWS * COLS
+_UNSET = array('i', [-1]) * N_CELLS
+_NO_SCORE = array('i', [N_CELLS + 1]) * N_CELLS  # larger than any path length
+_ZEROS = bytes(N_CELLS)
+_NO_BLOCKED = bytearray(N_CELLS)  # default blocked mask; writable so Numba sees the same array type as in-game masks
+
+_ASTAR_OPEN = []
+_ASTAR_CAMEFROM = array('i', _UNSET)
+_ASTAR_G = array('i', _NO_SCORE)
+_ASTAR_INOPEN = bytearray(N_CELLS)
+
+_BFS_QUEUE = deque()
+_BFS_NEXT = array('i', _UNSET)
+
+
+@lru_cache(maxsize=8)
+def heuristic_table(goal):
+    """Manhattan distance to goal for every cell, indexed by r * COLS + c. Cached per goal; do not mutate."""
+    gr, gc = goal
+    return [abs(r - gr) + abs(c - gc) for r in range(ROWS) for c in range(COLS)]
 
 
 def reconstruct_path(came_from, current, start):
-    path = [current]
-    while current in came_from:
+    """Walk came_from (cell index -> previous index, -1 = none) back from current; returns (row, col) cells."""
+    path = [divmod(current, COLS)]
+    while came_from[current] != -1:
         current = came_from[current]
-        path.append(current)
+        path.append(divmod(current, COLS))
     path.reverse()
     return path
 
 
-def astar(grid, start, goal, blocked=None):
-    """A* from start to goal; blocked is a set of cells to treat as walls (e.g. ghost positions)."""
-    if start is None or goal is None:
+def blocked_mask_for(cells):
+    """Flat mask (same layout as the grid) with 1 on each of the given cells."""
+    mask = bytearray(ROWS * COLS)
+    for (r, c) in cells:
+        mask[r * COLS + c] = 1
+    return mask
+
+
+def straight_path(grid, start, goal, blocked_mask):
+    """
+    If start and goal share a row or column with no wall or blocked cell between
+    them, that line matches the Manhattan lower bound and is a shortest path:
+    return it. Otherwise None.
+    """
+    (sr, sc), (gr, gc) = start, goal
+    if sr == gr:
+        step = 1 if gc >= sc else -1
+        cells = [(sr, c) for c in range(sc, gc + step, step)]
+    elif sc == gc:
+        step = 1 if gr >= sr else -1
+        cells = [(r, sc) for r in range(sr, gr + step, step)]
+    else:
         return None
 
-    if blocked is None:
-        blocked = set()
+    for (r, c) in cells[1:]:
+        i = r * COLS + c
+        if grid[i] == WALL or blocked_mask[i]:
+            return None
+    return cells
 
-    g_score = {(r, c): float('inf') for r in range(ROWS) for c in range(COLS)}
-    f_score = {(r, c): float('inf') for r in range(ROWS) for c in range(COLS)}
 
-    g_score[start] = 0
-    f_score[start] = heuristic(start, goal)
+def astar(grid, start, goal, blocked_mask=None):
+    """A* from start to goal; blocked_mask marks extra cells to treat as walls (e.g. ghost positions)."""
+    if start is None or goal is None:
+        return None
 
-    open_set = []
-    heappush(open_set, (f_score[start], 0, start))
-    came_from = {}
-    in_open = {start}
+    if blocked_mask is None:
+        blocked_mask = _NO_BLOCKED
+
+    # Open corridor straight to the goal: no search needed
+    path = straight_path(grid, start, goal, blocked_mask)
+    if path is not None:
+        return path
+
+    if njit is not None:
+        return _astar_numba(grid, start, goal, blocked_mask)
+
+    # Hot-loop names bound locally
+    dirs, rows, cols, wall = DIRS, ROWS, COLS, WALL
+    push, pop = heappush, heappop
+
+    # Cells are plain ints (r * cols + c) from here on
+    start_i = start[0] * cols + start[1]
+    goal_i = goal[0] * cols + goal[1]
+
+    open_set = _ASTAR_OPEN
+    came_from = _ASTAR_CAMEFROM
+    g_score = _ASTAR_G  # the f value lives solely in the heap entry
+    in_open = _ASTAR_INOPEN
+    open_set.clear()
+    came_from[:] = _UNSET
+    g_score[:] = _NO_SCORE
+    in_open[:] = _ZEROS
+
+    h = heuristic_table(goal)
+    g_score[start_i] = 0
+    push(open_set, (h[start_i], 0, start_i))
+    in_open[start_i] = 1
     counter = 0
 
     while open_set:
-        _, _, current = heappop(open_set)
-        in_open.discard(current)
+        _, _, current = pop(open_set)
+        in_open[current] = 0
 
-        if current == goal:
-            return reconstruct_path(came_from, goal, start)
+        if current == goal_i:
+            return reconstruct_path(came_from, goal_i, start_i)
 
-        (r, c) = current
+        r, c = divmod(current, cols)
 
-        for dr, dc in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+        for dr, dc in dirs:
             nr, nc = r + dr, c + dc
-            if not (0 <= nr < ROWS and 0 <= nc < COLS):
+            if not (0 <= nr < rows and 0 <= nc < cols):
                 continue
-            if grid[nr][nc] == WALL:
+            neighbor = nr * cols + nc
+            if grid[neighbor] == wall:
                 continue
-            if (nr, nc) in blocked:
+            if blocked_mask[neighbor]:
                 continue
 
-            neighbor = (nr, nc)
             tentative_g = g_score[current] + 1
 
             if tentative_g < g_score[neighbor]:
                 came_from[neighbor] = current
                 g_score[neighbor] = tentative_g
-                f_score[neighbor] = tentative_g + heuristic(neighbor, goal)
 
-                if neighbor not in in_open:
+                if not in_open[neighbor]:
                     counter += 1
-                    heappush(open_set, (f_score[neighbor], counter, neighbor))
-                    in_open.add(neighbor)
+                    push(open_set, (tentative_g + h[neighbor], counter, neighbor))
+                    in_open[neighbor] = 1
 
     return None  # no path
 
 
 # ---------- BFS FOR GHOSTS (chasing Pac-Man) ----------
 
-def bfs_path(grid, start, goal):
-    """Simple BFS path for a ghost from start to Pac-Man."""
-    if start is None or goal is None:
-        return None
-    if start == goal:
-        return [start]
+def bfs_from(grid, target):
+    """
+    Single BFS outward from target (Pac-Man). Returns a flat array where entry
+    r * COLS + c is the index of the neighbour one step closer to target, i.e.
+    the next move for a ghost on (r, c); -1 for target itself and unreachable cells.
+    The array is always the shared _BFS_NEXT buffer, overwritten by the next call.
+    """
+    if target is None:
+        _BFS_NEXT[:] = _UNSET
+        return _BFS_NEXT
 
-    q = deque([start])
-    visited = {start}
-    came_from = {}
+    if njit is not None:
+        return _bfs_from_numba(grid, target)
+
+    dirs, rows, cols, wall = DIRS, ROWS, COLS, WALL
+    target_i = target[0] * cols + target[1]
+    q = _BFS_QUEUE
+    next_step = _BFS_NEXT
+    q.clear()
+    next_step[:] = _UNSET
+
+    q.append(target_i)
+    next_step[target_i] = target_i
 
     while q:
         current = q.popleft()
-        if current == goal:
-            path = [current]
-            while current in came_from:
-                current = came_from[current]
-                path.append(current)
-            path.reverse()
-            return path
-
-        (r, c) = current
-        for dr, dc in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+        r, c = divmod(current, cols)
+        for dr, dc in dirs:
             nr, nc = r + dr, c + dc
-            if not (0 <= nr < ROWS and 0 <= nc < COLS):
+            if not (0 <= nr < rows and 0 <= nc < cols):
                 continue
-            if grid[nr][nc] == WALL:
+            nxt = nr * cols + nc
+            if grid[nxt] == wall:
                 continue
-            nxt = (nr, nc)
-            if nxt not in visited:
-                visited.add(nxt)
-                came_from[nxt] = current
+            if next_step[nxt] == -1:
+                next_step[nxt] = current
                 q.append(nxt)
 
-    return None
+    next_step[target_i] = -1
+    return next_step
+
+
+# ---------- NUMBA KERNELS (used when numba is installed) ----------
+# Same searches as above, on integer cell indices (r * COLS + c) and numpy arrays.
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _astar_nb(grid, rows, cols, start, goal, blocked):
+        """Returns (came_from, found); came_from[i] is the previous cell index, -1 if never reached."""
+        n = rows * cols
+        came_from = np.full(n, -1, np.int32)
+        g_score = np.full(n, n + 1, np.int32)  # n + 1 is larger than any path length
+        in_open = np.zeros(n, np.uint8)
+        gr = goal // cols
+        gc = goal % cols
+
+        g_score[start] = 0
+        open_set = [(abs(start // cols - gr) + abs(start % cols - gc), 0, start)]
+        in_open[start] = 1
+        counter = 0
+
+        while open_set:
+            _, _, current = heappop(open_set)
+            in_open[current] = 0
+
+            if current == goal:
+                return came_from, True
+
+            r = current // cols
+            c = current % cols
+            for dr, dc in DIRS:
+                nr = r + dr
+                nc = c + dc
+                if nr < 0 or nr >= rows or nc < 0 or nc >= cols:
+                    continue
+                neighbor = nr * cols + nc
+                if grid[neighbor] == WALL or blocked[neighbor]:
+                    continue
+
+                tentative_g = g_score[current] + 1
+                if tentative_g < g_score[neighbor]:
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g
+
+                    if not in_open[neighbor]:
+                        counter += 1
+                        heappush(open_set, (tentative_g + abs(nr - gr) + abs(nc - gc), counter, neighbor))
+                        in_open[neighbor] = 1
+
+        return came_from, False
+
+    @njit(cache=True)
+    def _bfs_from_nb(grid, rows, cols, target, next_step):
+        """Fills next_step[i] with the neighbour of cell i one step closer to target, -1 for target / unreachable."""
+        n = rows * cols
+        next_step[:] = -1
+        queue = np.empty(n, np.int32)
+        queue[0] = target
+        next_step[target] = target
+        head = 0
+        tail = 1
+
+        while head < tail:
+            current = queue[head]
+            head += 1
+            r = current // cols
+            c = current % cols
+            for dr, dc in DIRS:
+                nr = r + dr
+                nc = c + dc
+                if nr < 0 or nr >= rows or nc < 0 or nc >= cols:
+                    continue
+                nxt = nr * cols + nc
+                if grid[nxt] == WALL or next_step[nxt] != -1:
+                    continue
+                next_step[nxt] = current
+                queue[tail] = nxt
+                tail += 1
+
+        next_step[target] = -1
+
+
+def _astar_numba(grid, start, goal, blocked_mask):
+    start_i = start[0] * COLS + start[1]
+    goal_i = goal[0] * COLS + goal[1]
+
+    came_from, found = _astar_nb(
+        np.frombuffer(grid, np.uint8), ROWS, COLS, start_i, goal_i, np.frombuffer(blocked_mask, np.uint8)
+    )
+    if not found:
+        return None
+
+    path = [goal]
+    current = goal_i
+    while current != start_i:
+        current = int(came_from[current])
+        path.append(divmod(current, COLS))
+    path.reverse()
+    return path
+
+
+def _bfs_from_numba(grid, target):
+    # The kernel writes straight into the shared array('i') buffer through a numpy view
+    _bfs_from_nb(
+        np.frombuffer(grid, np.uint8), ROWS, COLS, target[0] * COLS + target[1], np.frombuffer(_BFS_NEXT, np.int32)
+    )
+    return _BFS_NEXT
 
 
 # ---------- PAC-MAN SPRITE ----------
@@ -263,7 +507,35 @@ def create_pacman_frames():
             p3 = (center[0] + radius, center[1] + radius // 2)
             pygame.draw.polygon(surf, (0, 0, 0, 0), [p1, p2, p3])
         frames.append(surf)
-    return frames
+    # Match the display format so blits take SDL's fast path
+    return [f.convert_alpha() for f in frames]
+
+
+def create_ghost_surface():
+    surf = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
+    gx, gy = CELL_SIZE // 2, CELL_SIZE // 2
+    radius = CELL_SIZE // 2 - 3
+    pygame.draw.circle(surf, (0, 102, 255), (gx, gy), radius)       # body
+    pygame.draw.circle(surf, (255, 255, 255), (gx - 5, gy - 4), 4)  # eyes
+    pygame.draw.circle(surf, (255, 255, 255), (gx + 5, gy - 4), 4)
+    pygame.draw.circle(surf, (0, 0, 0), (gx - 5, gy - 4), 2)
+    pygame.draw.circle(surf, (0, 0, 0), (gx + 5, gy - 4), 2)
+    return surf.convert_alpha()
+
+
+def create_diamond_surface():
+    surf = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
+    cx, cy = CELL_SIZE // 2, CELL_SIZE // 2
+    size = CELL_SIZE // 3
+    points = [
+        (cx, cy - size),   # top
+        (cx + size, cy),   # right
+        (cx, cy + size),   # bottom
+        (cx - size, cy),   # left
+    ]
+    pygame.draw.polygon(surf, (255, 215, 0), points)
+    pygame.draw.polygon(surf, (255, 255, 255), points, 2)
+    return surf.convert_alpha()
 
 
 # ---------- LEVEL LOADING (centered, multiple ghosts) ----------
@@ -303,20 +575,20 @@ def load_level(filename):
                 continue
 
             if ch == "#":
-                grid[gr][gc] = WALL
+                grid[gr * COLS + gc] = WALL
             elif ch == "S":
-                grid[gr][gc] = START
+                grid[gr * COLS + gc] = START
                 start = (gr, gc)
             elif ch == "G":
-                grid[gr][gc] = GOAL
+                grid[gr * COLS + gc] = GOAL
                 goal = (gr, gc)
             elif ch == "D":
-                grid[gr][gc] = REWARD
+                grid[gr * COLS + gc] = REWARD
                 reward_cells.add((gr, gc))
             elif ch == "X":
                 ghost_positions.append((gr, gc))
             else:
-                grid[gr][gc] = EMPTY
+                grid[gr * COLS + gc] = EMPTY
 
     return grid, start, goal, reward_cells, ghost_positions
 
@@ -325,12 +597,20 @@ def load_level(filename):
 
 def main():
     grid = make_grid()
+    if njit is not None:
+        # Compile (or load cached) Numba kernels now rather than on the first replan.
+        # Start/goal must not be in a straight line, or straight_path answers without the kernel;
+        # the writable mask matches what the game loop passes.
+        astar(grid, (0, 0), (1, 1), bytearray(ROWS * COLS))
+        bfs_from(grid, (0, 0))
     start = None
     goal = None
     reward_cells = set()
 
     pac_frames = create_pacman_frames()
     pac_frame_idx = 0
+    ghost_surf = create_ghost_surface()
+    diamond_surf = create_diamond_surface()
 
     pac_pos = None
     # multiple ghosts now
@@ -339,7 +619,7 @@ def main():
     # by default, spawn ghosts at corners where not walls
     for (r, c) in corner_positions():
         if 0 <= r < ROWS and 0 <= c < COLS:
-            if grid[r][c] != WALL:
+            if grid[r * COLS + c] != WALL:
                 ghost_positions.append((r, c))
 
     playing = False
@@ -353,15 +633,40 @@ def main():
     last_pac_move_time = 0
     last_ghost_move_time = 0
 
+    # Pac-Man follows a cached A* path until a ghost steps onto it or the grid changes
+    grid_version = 0
+    pac_path = None
+    pac_path_idx = 0
+    pac_path_version = -1
+    blocked_mask = bytearray(ROWS * COLS)  # ghost cells, rebuilt once per ghost move
+
     clock = pygame.time.Clock()
+    bg_dirty = True
+    dirty_rects = []
+    sprites = set()  # (cell, surface) pairs drawn for ghosts / Pac-Man on the previous frame
+    drawn_rewards = set()  # diamond cells drawn on the previous frame
+    last_hud_state = None
+    last_hud_rect = HUD_RECT
+    last_pac_frame_time = 0
+
+    # Bind per-frame pygame calls to locals once
+    get_ticks = pygame.time.get_ticks
+    get_events = pygame.event.get
+    get_mouse_pressed = pygame.mouse.get_pressed
+    get_mouse_pos = pygame.mouse.get_pos
+    get_keys = pygame.key.get_pressed
 
     while True:
         clock.tick(60)
-        for event in pygame.event.get():
+        for event in get_events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
 
+            if event.type == pygame.VIDEOEXPOSE:
+                # Window contents were lost; repaint everything
+                bg_dirty = True
+
             # Keyboard controls
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_c:
@@ -374,7 +679,7 @@ def main():
                     ghost_positions = []
                     for (r, c) in corner_positions():
                         if 0 <= r < ROWS and 0 <= c < COLS:
-                            if grid[r][c] != WALL:
+                            if grid[r * COLS + c] != WALL:
                                 ghost_positions.append((r, c))
 
                     playing = False
@@ -384,6 +689,8 @@ def main():
                     final_score = None
                     start_time = None
                     end_time = None
+                    bg_dirty = True
+                    grid_version += 1
 
                 if event.key == pygame.K_l:
                     # Load level1.txt (centered), then also add corner ghosts if possible
@@ -391,7 +698,7 @@ def main():
                     # ensure corner ghosts exist (on non-wall cells)
                     corners = corner_positions()
                     for (r, c) in corners:
-                        if 0 <= r < ROWS and 0 <= c < COLS and grid[r][c] != WALL:
+                        if 0 <= r < ROWS and 0 <= c < COLS and grid[r * COLS + c] != WALL:
                             if (r, c) not in ghost_positions:
                                 ghost_positions.append((r, c))
 
@@ -403,6 +710,8 @@ def main():
                     final_score = None
                     start_time = None
                     end_time = None
+                    bg_dirty = True
+                    grid_version += 1
 
                 if event.key == pygame.K_SPACE and start and goal and not playing:
                     # Start game
@@ -412,10 +721,12 @@ def main():
                     pac_pos = start
                     score = 0
                     final_score = None
-                    start_time = pygame.time.get_ticks()
+                    start_time = get_ticks()
                     end_time = None
                     last_pac_move_time = start_time
                     last_ghost_move_time = start_time
+                    pac_path = None
+                    blocked_mask = blocked_mask_for(ghost_positions)
 
                 if event.key == pygame.K_r:
                     # Reset run but keep maze and ghosts
@@ -429,44 +740,55 @@ def main():
 
         # Mouse editing only when not playing / not game over
         if not playing and not game_over:
-            if pygame.mouse.get_pressed()[0]:  # left click
-                pos = pygame.mouse.get_pos()
+            mouse_buttons = get_mouse_pressed()
+            if mouse_buttons[0]:  # left click
+                pos = get_mouse_pos()
                 cell = get_cell_from_mouse(pos)
                 if cell:
                     r, c = cell
-                    keys = pygame.key.get_pressed()
+                    keys = get_keys()
 
+                    # Grid writes (and the background rebuild they trigger) only happen when
+                    # the cell actually changes, so holding the button over it costs nothing
                     if keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]:
                         # Shift + click => diamond
-                        if (r, c) != start and (r, c) != goal:
-                            grid[r][c] = REWARD
+                        if (r, c) != start and (r, c) != goal and grid[r * COLS + c] != REWARD:
+                            grid[r * COLS + c] = REWARD
                             reward_cells.add((r, c))
+                            bg_dirty = True
+                            grid_version += 1
 
                     elif keys[pygame.K_g]:
-                        # G + click => add ghost at clicked cell
-                        if (r, c) not in ghost_positions:
+                        # G + click => add ghost at clicked cell (not on walls: the BFS from Pac-Man never reaches them)
+                        if (r, c) not in ghost_positions and grid[r * COLS + c] != WALL:
                             ghost_positions.append((r, c))
 
                     else:
                         # Normal left click: start, goal, then walls
                         if not start:
                             start = (r, c)
-                            grid[r][c] = START
+                            grid[r * COLS + c] = START
                             reward_cells.discard((r, c))
+                            bg_dirty = True
+                            grid_version += 1
                         elif not goal and (r, c) != start:
                             goal = (r, c)
-                            grid[r][c] = GOAL
+                            grid[r * COLS + c] = GOAL
                             reward_cells.discard((r, c))
-                        elif (r, c) != start and (r, c) != goal:
-                            grid[r][c] = WALL
+                            bg_dirty = True
+                            grid_version += 1
+                        elif (r, c) != start and (r, c) != goal and grid[r * COLS + c] != WALL:
+                            grid[r * COLS + c] = WALL
                             reward_cells.discard((r, c))
+                            bg_dirty = True
+                            grid_version += 1
 
                             # if we place a wall on a ghost, remove that ghost
                             if (r, c) in ghost_positions:
                                 ghost_positions.remove((r, c))
 
-            elif pygame.mouse.get_pressed()[2]:  # right click to erase
-                pos = pygame.mouse.get_pos()
+            elif mouse_buttons[2]:  # right click to erase
+                pos = get_mouse_pos()
                 cell = get_cell_from_mouse(pos)
                 if cell:
                     r, c = cell
@@ -476,20 +798,29 @@ def main():
                         goal = None
                     if (r, c) in ghost_positions:
                         ghost_positions.remove((r, c))
-                    grid[r][c] = EMPTY
-                    reward_cells.discard((r, c))
+                    if grid[r * COLS + c] != EMPTY:
+                        grid[r * COLS + c] = EMPTY
+                        reward_cells.discard((r, c))
+                        bg_dirty = True
+                        grid_version += 1
 
         # ---------- GAME LOGIC ----------
         if playing and not game_over and pac_pos is not None:
-            now = pygame.time.get_ticks()
+            now = get_ticks()
 
-            # Pac-Man movement (A* replanning)
+            # Pac-Man movement (A* replanning only when the cached path is no longer usable)
             if now - last_pac_move_time >= PAC_MOVE_INTERVAL:
                 last_pac_move_time = now
-                blocked = set(ghost_positions) if ghost_positions else set()
-                path = astar(grid, pac_pos, goal, blocked=blocked)
-
-                if path is None or len(path) < 2:
+                path_ok = False
+                if pac_path is not None and pac_path_version == grid_version and pac_path_idx + 1 < len(pac_path):
+                    nr, nc = pac_path[pac_path_idx + 1]
+                    path_ok = not blocked_mask[nr * COLS + nc]
+                if not path_ok:
+                    pac_path = astar(grid, pac_pos, goal, blocked_mask=blocked_mask)
+                    pac_path_idx = 0
+                    pac_path_version = grid_version
+
+                if pac_path is None or len(pac_path) < 2:
                     # No path to goal
                     playing = False
                     game_over = True
@@ -497,8 +828,8 @@ def main():
                     final_score = score
                     end_time = now
                 else:
-                    next_cell = path[1]
-                    pac_pos = next_cell
+                    pac_path_idx += 1
+                    pac_pos = pac_path[pac_path_idx]
 
                     # Collect reward
                     if pac_pos in reward_cells:
@@ -516,14 +847,14 @@ def main():
             # Ghosts movement (BFS chase)
             if ghost_positions and pac_pos is not None and now - last_ghost_move_time >= GHOST_MOVE_INTERVAL:
                 last_ghost_move_time = now
+                # One BFS from Pac-Man serves every ghost
+                next_step = bfs_from(grid, pac_pos)
                 new_ghost_positions = []
-                for gpos in ghost_positions:
-                    path_g = bfs_path(grid, gpos, pac_pos)
-                    if path_g is not None and len(path_g) >= 2:
-                        new_ghost_positions.append(path_g[1])
-                    else:
-                        new_ghost_positions.append(gpos)
+                for (gr, gc) in ghost_positions:
+                    step = next_step[gr * COLS + gc]
+                    new_ghost_positions.append(divmod(step, COLS) if step != -1 else (gr, gc))
                 ghost_positions = new_ghost_positions
+                blocked_mask = blocked_mask_for(ghost_positions)
 
             # Check collision with any ghost
             if pac_pos is not None and ghost_positions and pac_pos in ghost_positions:
@@ -531,53 +862,66 @@ def main():
                 game_over = True
                 reason = "ghost"
                 final_score = score
-                end_time = pygame.time.get_ticks()
+                end_time = get_ticks()
 
         # ---------- DRAW ----------
-        draw_grid(WIN, grid)
-
-        # Draw diamonds as diamond shapes
-        for (r, c) in reward_cells:
-            cx = c * CELL_SIZE + CELL_SIZE // 2
-            cy = r * CELL_SIZE + CELL_SIZE // 2
-            size = CELL_SIZE // 3
-            points = [
-                (cx, cy - size),   # top
-                (cx + size, cy),   # right
-                (cx, cy + size),   # bottom
-                (cx - size, cy),   # left
-            ]
-            pygame.draw.polygon(WIN, (255, 215, 0), points)
-            pygame.draw.polygon(WIN, (255, 255, 255), points, 2)
-
-        # Draw all ghosts (blue)
-        for (gr, gc) in ghost_positions:
-            gx = gc * CELL_SIZE + CELL_SIZE // 2
-            gy = gr * CELL_SIZE + CELL_SIZE // 2
-            radius = CELL_SIZE // 2 - 3
-            pygame.draw.circle(WIN, (0, 102, 255), (gx, gy), radius)       # body
-            pygame.draw.circle(WIN, (255, 255, 255), (gx - 5, gy - 4), 4)  # eyes
-            pygame.draw.circle(WIN, (255, 255, 255), (gx + 5, gy - 4), 4)
-            pygame.draw.circle(WIN, (0, 0, 0), (gx - 5, gy - 4), 2)
-            pygame.draw.circle(WIN, (0, 0, 0), (gx + 5, gy - 4), 2)
-
-        # Draw Pac-Man
-        if pac_pos is not None:
-            pac_frame = pac_frames[pac_frame_idx]
+        # Mouth animation runs on its own timer rather than flipping every frame
+        frame_time = get_ticks()
+        if frame_time - last_pac_frame_time >= PAC_ANIM_INTERVAL:
+            last_pac_frame_time = frame_time
             pac_frame_idx = (pac_frame_idx + 1) % len(pac_frames)
-            px = pac_pos[1] * CELL_SIZE
-            py = pac_pos[0] * CELL_SIZE
-            WIN.blit(pac_frame, (px, py))
-
-        draw_hud(WIN, score, start_time, end_time, game_over, final_score, reason)
 
-        hint = FONT_SMALL.render(
-            "L: load level   C: clear   SPACE: start   R: reset   Click: S/G/Walls   Shift+Click: diamond   G+Click: ghost",
-            True, (160, 160, 255),
-        )
-        WIN.blit(hint, (10, HEIGHT - 25))
-
-        pygame.display.update()
+        sprite_list = [(gpos, ghost_surf) for gpos in ghost_positions]
+        if pac_pos is not None:
+            sprite_list.append((pac_pos, pac_frames[pac_frame_idx]))
+        new_sprites = set(sprite_list)
+
+        time_str = hud_time_str(start_time, end_time, game_over)
+        hud_state = (score, time_str, game_over, reason, final_score)
+        hud_rect = HUD_RECT if game_over else HUD_STATS_RECT
+
+        if bg_dirty:
+            rebuild_bg(grid)
+            bg_dirty = False
+            WIN.blit(bg_surface, (0, 0))
+            dirty_rects.append(WIN.get_rect())
+            hud_damaged = True
+        else:
+            # Cells whose sprite appeared, left or changed frame, and collected diamonds
+            dirty_rects.extend(cell_rect(cell) for cell, _ in new_sprites ^ sprites)
+            dirty_rects.extend(cell_rect(cell) for cell in drawn_rewards - reward_cells)
+            # The HUD is drawn on top, so it is redone when its text changes or anything under it does
+            hud_area = hud_rect.union(last_hud_rect)
+            hud_damaged = hud_state != last_hud_state or hud_area.collidelist(dirty_rects) != -1
+            if hud_damaged:
+                dirty_rects.append(hud_area)
+            for rect in dirty_rects:
+                WIN.blit(bg_surface, rect, rect)
+
+        if dirty_rects:
+            # Redraw whatever overlaps a restored area: diamonds, ghosts and Pac-Man in one batched blit
+            blit_list = []
+            for cell in reward_cells:
+                rect = cell_rect(cell)
+                if rect.collidelist(dirty_rects) != -1:
+                    blit_list.append((diamond_surf, rect))
+            for cell, surf in sprite_list:
+                rect = cell_rect(cell)
+                if rect.collidelist(dirty_rects) != -1:
+                    blit_list.append((surf, rect))
+            WIN.blits(blit_list, doreturn=0)
+
+            if hud_damaged:
+                draw_hud(WIN, score, time_str, game_over, final_score, reason)
+
+        sprites = new_sprites
+        if drawn_rewards != reward_cells:
+            drawn_rewards = set(reward_cells)
+        last_hud_state = hud_state
+        last_hud_rect = hud_rect
+
+        pygame.display.update(dirty_rects)
+        dirty_rects.clear()
 
 
 if __name__ == "__main__":